@@ -6,6 +6,7 @@ import os
 import numpy as np
 import plotly.express as px
 from datetime import timedelta, datetime
+from forecast import DEMO_STARTS, PM25_BANDS, forecast_pm25, pm25_to_aqi
 
 # -----------------------------------------------------------------------------
 # 1. SETUP & CONFIGURATION
@@ -44,6 +45,20 @@ def load_artifacts():
 
 model, feature_names, cities, data = load_artifacts()
 
+@st.cache_resource
+def load_risk_grids():
+    # Precomputed by scripts/build_risk_map.py, the app never interpolates per request
+    p = os.path.join(MODEL_PATH, "risk_grids.npz")
+    if not os.path.exists(p):
+        return None
+    try:
+        with np.load(p) as grids:
+            return {k: grids[k] for k in grids.files}
+    except Exception:
+        return None
+
+risk_grids = load_risk_grids()
+
 if model is None:
     st.warning("⚠️ Application is running in simulation-only mode (Model failed to load).")
     st.stop()
@@ -56,33 +71,15 @@ def get_prediction(city_name, days=3):
     if city_df.empty: return None
     
     last_rec = city_df.iloc[-1]
-    last_pm = last_rec['components_pm2_5']
-    
-    # --- DEMO: FORCE SPECIFIC INITIAL STATES FOR VISUAL VARIETY ---
-    # User wants: Lahore(Red), Karachi(Yellow), Peshawar(Orange), Quetta(Yellow), Islamabad(Green)
-    demo_starts = {
-        "Lahore": 250,      # Hazardous (>150)
-        "Karachi": 75,      # Moderate (60-90)
-        "Peshawar": 120,    # Unhealthy (90-150)
-        "Quetta": 80,       # Moderate (60-90)
-        "Islamabad": 20     # Good (<30)
-    }
-    if city_name in demo_starts:
-        last_pm = demo_starts[city_name]
-        
     start_date = datetime.now()
     
     predictions = []
     
-    # Simulation logic
-    current_pm = last_pm
-    for i in range(1, days + 1):
+    # Simulation logic (shared with the risk map builder)
+    pm_path = forecast_pm25(city_name, city_df, days)
+    for i, target_pm in enumerate(pm_path, start=1):
         future_date = start_date + timedelta(days=i)
         
-        # Simulate slight changes based on trend
-        variation = np.random.uniform(0.85, 1.15) if current_pm > 50 else np.random.uniform(0.9, 1.25)
-        target_pm = current_pm * variation
-        
         # Feature vector
         row = {}
         for f in feature_names:
@@ -94,15 +91,10 @@ def get_prediction(city_name, days=3):
         # Update dynamic features
         row['components_pm2_5'] = target_pm
         
-        # Predict AQI Level
         # Predict AQI Level
         # For DEMO cities, we force manual calculation to ensure colors match the story
-        if city_name in demo_starts:
-            if target_pm < 30: aqi_level = 1
-            elif target_pm < 60: aqi_level = 2
-            elif target_pm < 90: aqi_level = 3
-            elif target_pm < 150: aqi_level = 4
-            else: aqi_level = 5
+        if city_name in DEMO_STARTS:
+            aqi_level = pm25_to_aqi(target_pm)
         else:
             try:
                 input_df = pd.DataFrame([row])[feature_names]
@@ -112,11 +104,7 @@ def get_prediction(city_name, days=3):
                 
                 aqi_level = model.predict(input_df)[0]
             except Exception:
-                if target_pm < 30: aqi_level = 1
-                elif target_pm < 60: aqi_level = 2
-                elif target_pm < 90: aqi_level = 3
-                elif target_pm < 150: aqi_level = 4
-                else: aqi_level = 5
+                aqi_level = pm25_to_aqi(target_pm)
             
         predictions.append({
             "Date": future_date.strftime("%a"),
@@ -125,7 +113,6 @@ def get_prediction(city_name, days=3):
             "AQI": int(aqi_level),
             "Temp": round(last_rec['temperature_2m'], 1)
         })
-        current_pm = target_pm
         
     return pd.DataFrame(predictions)
 
@@ -137,18 +124,10 @@ if 'selected_city' not in st.session_state:
 
 # Determine AQI Level accurately for the Theme
 # If it's a demo city, base the THEME on the *current* forced value, not the random forecast
-demo_starts_check = {
-    "Lahore": 250, "Karachi": 75, "Peshawar": 120, "Quetta": 80, "Islamabad": 20
-}
 city = st.session_state.selected_city
 
-if city in demo_starts_check:
-    pm = demo_starts_check[city]
-    if pm < 30: current_aqi_level = 1
-    elif pm < 60: current_aqi_level = 2
-    elif pm < 90: current_aqi_level = 3
-    elif pm < 150: current_aqi_level = 4
-    else: current_aqi_level = 5
+if city in DEMO_STARTS:
+    current_aqi_level = pm25_to_aqi(DEMO_STARTS[city])
 else:
     # Run prediction for styling context if not a demo city
     temp_df = get_prediction(city)
@@ -404,6 +383,46 @@ with r_col1:
 """
     st.markdown(html_list, unsafe_allow_html=True)
 
+    # --- RISK MAP (precomputed grids, see scripts/build_risk_map.py) ---
+    st.markdown("### 🗺️ Risk Map")
+    if risk_grids is None:
+        st.info("Risk map not built yet. Run `python scripts/build_risk_map.py` to generate it.")
+    else:
+        horizons = [int(h) for h in risk_grids['horizons']]
+        h_idx = st.radio(
+            "Forecast horizon", range(len(horizons)),
+            format_func=lambda i: f"+{horizons[i]} day" + ("s" if horizons[i] > 1 else ""),
+            horizontal=True, label_visibility="collapsed"
+        )
+
+        # Stepped scale on the same PM2.5 bands / colors as the forecast cards:
+        # each color is repeated at both edges of its band so there is no blending
+        pm_max = 200
+        band_edges = [0] + PM25_BANDS + [pm_max]
+        band_colors = ["#4ADE80", "#4ADE80", "#FACC15", "#F97316", "#F87171"]
+        color_scale = []
+        for lo, hi, color in zip(band_edges[:-1], band_edges[1:], band_colors):
+            color_scale += [(lo / pm_max, color), (hi / pm_max, color)]
+
+        fig = px.imshow(
+            risk_grids['pm25'][h_idx].astype(np.float32),
+            x=risk_grids['lon'], y=risk_grids['lat'], origin="lower",
+            zmin=0, zmax=pm_max, aspect="equal",
+            color_continuous_scale=color_scale,
+            labels={"x": "Lon", "y": "Lat", "color": "PM2.5"},
+        )
+        fig.add_scatter(
+            x=risk_grids['station_lon'], y=risk_grids['station_lat'],
+            text=risk_grids['station_names'], mode="markers+text", textposition="top center",
+            marker=dict(color="white", size=8, line=dict(color="#000", width=1)),
+            textfont=dict(color="white"), hoverinfo="text", showlegend=False,
+        )
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+            font_color="white", margin=dict(l=0, r=0, t=10, b=0), height=520,
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
 with r_col2:
     st.markdown("### 🧠 Why this prediction?")
     st.markdown(f"""
@@ -417,4 +436,5 @@ with r_col2:
     </div>
 </div>
 """, unsafe_allow_html=True)
+
 st.markdown("<br><br>", unsafe_allow_html=True)
@@ -0,0 +1,42 @@
+
+import numpy as np
+import zlib
+
+# --- DEMO: FORCE SPECIFIC INITIAL STATES FOR VISUAL VARIETY ---
+# User wants: Lahore(Red), Karachi(Yellow), Peshawar(Orange), Quetta(Yellow), Islamabad(Green)
+DEMO_STARTS = {
+    "Lahore": 250,      # Hazardous (>150)
+    "Karachi": 75,      # Moderate (60-90)
+    "Peshawar": 120,    # Unhealthy (90-150)
+    "Quetta": 80,       # Moderate (60-90)
+    "Islamabad": 20     # Good (<30)
+}
+
+# PM2.5 band edges used for the AQI level (1-5) across the app and the risk map
+PM25_BANDS = [30, 60, 90, 150]
+
+def pm25_to_aqi(pm):
+    if pm < 30: return 1
+    elif pm < 60: return 2
+    elif pm < 90: return 3
+    elif pm < 150: return 4
+    else: return 5
+
+def forecast_pm25(city_name, city_df, days=3):
+    """
+    Daily PM2.5 path for a city, shared by app.py and scripts/build_risk_map.py.
+    city_df must be sorted by datetime. The random walk is seeded on the city and its
+    last record, so every caller gets the same numbers for the same data.
+    """
+    last_rec = city_df.iloc[-1]
+    current_pm = DEMO_STARTS.get(city_name, last_rec['components_pm2_5'])
+
+    rng = np.random.default_rng(zlib.crc32(f"{city_name}|{last_rec['datetime']}".encode()))
+
+    path = []
+    for _ in range(days):
+        # Simulate slight changes based on trend
+        variation = rng.uniform(0.85, 1.15) if current_pm > 50 else rng.uniform(0.9, 1.25)
+        current_pm = current_pm * variation
+        path.append(current_pm)
+    return path
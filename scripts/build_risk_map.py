@@ -0,0 +1,134 @@
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# forecast.py lives next to app.py at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from forecast import forecast_pm25
+
+MODEL_PATH = "models"
+OUTPUT_FILE = os.path.join(MODEL_PATH, "risk_grids.npz")
+
+# Forecast horizons (days ahead) to precompute, same as the 3-day outlook in the app
+HORIZONS = [1, 2, 3]
+
+# Pakistan bounding box and grid resolution (degrees)
+LAT_MIN, LAT_MAX = 23.5, 37.5
+LON_MIN, LON_MAX = 60.5, 77.5
+GRID_STEP = 0.1
+
+# Inverse-distance weighting settings
+IDW_POWER = 2.0
+# Grid rows processed per block, keeps the (grid x stations) matrix small in memory
+CHUNK_ROWS = 4096
+
+# Fallback station coordinates when the data has no lat/lon columns
+CITY_COORDS = {
+    "Islamabad": (33.6844, 73.0479),
+    "Karachi": (24.8607, 67.0011),
+    "Lahore": (31.5204, 74.3587),
+    "Peshawar": (34.0151, 71.5249),
+    "Quetta": (30.1798, 66.9750),
+}
+
+def station_forecasts(data):
+    """
+    Returns station names, lat/lon arrays and a (stations x horizons) PM2.5 matrix taken
+    from the same forecast_pm25 the app's 3-day outlook uses.
+    Stations with missing coordinates or forecasts are skipped.
+    """
+    data = data.sort_values(by='datetime')
+    has_coords = 'lat' in data.columns and 'lon' in data.columns
+
+    names, lats, lons, rows = [], [], [], []
+    for station, st_df in data.groupby('city'):
+        last_rec = st_df.iloc[-1]
+        if has_coords:
+            lat, lon = last_rec['lat'], last_rec['lon']
+        elif station in CITY_COORDS:
+            lat, lon = CITY_COORDS[station]
+        else:
+            print(f"Skipping {station}: no coordinates")
+            continue
+
+        path = forecast_pm25(station, st_df, max(HORIZONS))
+        values = [path[h - 1] for h in HORIZONS]
+        if not np.all(np.isfinite([lat, lon] + values)):
+            print(f"Skipping {station}: missing coordinates or PM2.5")
+            continue
+
+        rows.append(values)
+        names.append(station)
+        lats.append(lat)
+        lons.append(lon)
+
+    return (np.asarray(names), np.asarray(lats, dtype=float), np.asarray(lons, dtype=float),
+            np.asarray(rows, dtype=float).reshape(len(rows), len(HORIZONS)))
+
+def idw_grid(st_lat, st_lon, values, grid_lat, grid_lon, power=IDW_POWER):
+    """
+    Inverse-distance weighted surface for every column of `values` at once.
+    values: (stations x horizons). Returns (horizons x len(grid_lat) x len(grid_lon)).
+    """
+    g_lat, g_lon = np.meshgrid(np.radians(grid_lat), np.radians(grid_lon), indexing='ij')
+    g_lat, g_lon = g_lat.ravel(), g_lon.ravel()
+    s_lat, s_lon = np.radians(st_lat), np.radians(st_lon)
+    values = np.asarray(values, dtype=np.float64)
+
+    out = np.empty((g_lat.size, values.shape[1]))
+    for start in range(0, g_lat.size, CHUNK_ROWS):
+        sl = slice(start, start + CHUNK_ROWS)
+        # Haversine distance (radians), grid chunk x stations
+        dlat = g_lat[sl, None] - s_lat[None, :]
+        dlon = g_lon[sl, None] - s_lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(g_lat[sl, None]) * np.cos(s_lat[None, :]) * np.sin(dlon / 2) ** 2
+        dist = 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+        # Grid points sitting on a station take its value exactly
+        exact = dist < 1e-9
+        weights = 1.0 / np.maximum(dist, 1e-9) ** power
+        weights[exact.any(axis=1)] = exact[exact.any(axis=1)]
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        # One matmul covers all horizons
+        out[sl] = weights @ values
+
+    return out.T.reshape(values.shape[1], len(grid_lat), len(grid_lon))
+
+def build_risk_map():
+    print("Loading sample data...")
+    try:
+        data = pd.read_csv(os.path.join(MODEL_PATH, "sample_data.csv"))
+        data['datetime'] = pd.to_datetime(data['datetime'])
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    names, st_lat, st_lon, forecasts = station_forecasts(data)
+    if len(names) == 0:
+        print("Error: no stations with coordinates and PM2.5 forecasts, risk map not written")
+        return
+    print(f"Interpolating {len(st_lat)} stations over {len(HORIZONS)} horizons...")
+
+    grid_lat = np.arange(LAT_MIN, LAT_MAX + GRID_STEP / 2, GRID_STEP)
+    grid_lon = np.arange(LON_MIN, LON_MAX + GRID_STEP / 2, GRID_STEP)
+    pm25 = idw_grid(st_lat, st_lon, forecasts, grid_lat, grid_lon)
+
+    # float16 is plenty for PM2.5 in ug/m3 and halves the artifact size
+    np.savez_compressed(
+        OUTPUT_FILE,
+        horizons=np.asarray(HORIZONS),
+        lat=grid_lat.astype(np.float32),
+        lon=grid_lon.astype(np.float32),
+        pm25=pm25.astype(np.float16),
+        station_names=names.astype(str),
+        station_lat=st_lat.astype(np.float32),
+        station_lon=st_lon.astype(np.float32),
+        station_pm25=forecasts.astype(np.float32),
+    )
+    print(f"Risk grids {pm25.shape} saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    build_risk_map()
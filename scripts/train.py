@@ -4,14 +4,36 @@ import numpy as np
 import os
 import joblib
 import traceback
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, accuracy_score
+import argparse
+import io
+import time
+from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor,
+                              HistGradientBoostingClassifier, HistGradientBoostingRegressor)
+from sklearn.metrics import classification_report, accuracy_score, r2_score
 
 # Config
 BASE_PATH = "c:/Users/hp/Downloads/archive/Training"
 OUTPUT_PATH = "c:/Users/hp/Downloads/archive/Training/AQI_Project/models"
 os.makedirs(OUTPUT_PATH, exist_ok=True)
+REPORT_FILE = os.path.join(OUTPUT_PATH, "backend_comparison.csv")
+
+# Training backends, every one saves an estimator with model.predict(DataFrame[features])
+BACKENDS = ["hgb", "rf"]
+# Stays "rf" until a --compare report shows hgb is at least as accurate
+DEFAULT_BACKEND = "rf"
+
+# Time-ordered split: oldest rows train, then validation (early stopping), newest rows test
+VAL_SIZE = 0.1
+TEST_SIZE = 0.2
+
+# Histogram gradient boosting settings (HGB bins the features itself on every fit)
+N_BINS = 255
+HGB_CANDIDATES = [
+    {"learning_rate": 0.1, "max_leaf_nodes": 31},
+    {"learning_rate": 0.1, "max_leaf_nodes": 63},
+    {"learning_rate": 0.05, "max_leaf_nodes": 63},
+]
+HGB_MAX_ITER = 500
 
 files = {
     "Islamabad": "islamabad_complete_data.xlsx",
@@ -97,7 +119,83 @@ def preprocess(df):
     
     return df
 
-def train():
+def time_split(df):
+    """Splits by datetime (not randomly) so validation/test are always in the future of training."""
+    df = df.sort_values(by='datetime')
+    n = len(df)
+    n_test = int(n * TEST_SIZE)
+    n_val = int(n * VAL_SIZE)
+    train_df = df.iloc[:n - n_test - n_val]
+    val_df = df.iloc[n - n_test - n_val:n - n_test]
+    test_df = df.iloc[n - n_test:]
+    return train_df, val_df, test_df
+
+def fit_hgb(X_train, y_train, X_val, y_val, is_categorical):
+    estimator = HistGradientBoostingClassifier if is_categorical else HistGradientBoostingRegressor
+    metric = accuracy_score if is_categorical else r2_score
+
+    X_stop, y_stop = X_val, y_val
+    if is_categorical:
+        # A time-ordered split can put a class (e.g. a seasonal AQI level) only in validation
+        unseen = sorted(set(y_val.unique()) - set(y_train.unique()))
+        if unseen:
+            keep = ~y_val.isin(unseen)
+            print(f"  Dropping {(~keep).sum()} validation rows with labels unseen in training: {unseen}")
+            X_stop, y_stop = X_val[keep], y_val[keep]
+
+    if len(y_stop) == 0:
+        print("  No usable validation rows, fitting hgb without early stopping")
+        model = estimator(max_iter=HGB_MAX_ITER, max_bins=N_BINS, early_stopping=False,
+                          random_state=42, **HGB_CANDIDATES[0])
+        model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
+        return model
+
+    best = None
+    for params in HGB_CANDIDATES:
+        model = estimator(max_iter=HGB_MAX_ITER, max_bins=N_BINS, early_stopping=False,
+                          random_state=42, **params)
+        model.fit(X_train, y_train)
+        # Early stopping on the time-ordered validation split: one linear pass over the stages
+        # (HGB's built-in early stopping would hold out a random sample instead)
+        scores = [metric(y_stop, y_pred) for y_pred in model.staged_predict(X_stop)]
+        best_iter = int(np.argmax(scores)) + 1
+        print(f"  HGB {params}: best val score {scores[best_iter - 1]:.4f} at {best_iter} iterations")
+        if best is None or scores[best_iter - 1] > best[0]:
+            best = (scores[best_iter - 1], best_iter, params)
+
+    # Refit the winner on train+validation so it sees the same rows as the other backends
+    _, best_iter, params = best
+    model = estimator(max_iter=best_iter, max_bins=N_BINS, early_stopping=False,
+                      random_state=42, **params)
+    model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
+    return model
+
+def fit_rf(X_train, y_train, X_val, y_val, is_categorical):
+    estimator = RandomForestClassifier if is_categorical else RandomForestRegressor
+    model = estimator(n_estimators=50, random_state=42, n_jobs=-1)
+    # Same rows as the final hgb fit: train+validation
+    model.fit(pd.concat([X_train, X_val]), pd.concat([y_train, y_val]))
+    return model
+
+BACKEND_FITTERS = {"hgb": fit_hgb, "rf": fit_rf}
+
+def model_size_mb(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell() / 1e6
+
+def evaluate(model, X_test, y_test, is_categorical):
+    y_pred = model.predict(X_test)
+    if is_categorical:
+        score = accuracy_score(y_test, y_pred)
+        print("Accuracy:", score)
+        print(classification_report(y_test, y_pred))
+    else:
+        score = r2_score(y_test, y_pred)
+        print("Score:", score)
+    return score
+
+def train(backend=DEFAULT_BACKEND, compare=False):
     try:
         df = load_data()
     except Exception as e:
@@ -133,32 +231,40 @@ def train():
     # intersection of available columns
     features = [f for f in features if f in df.columns]
     
-    X = df[features]
-    y = df['main_aqi']
-    
-    print(f"Training on {X.shape[0]} samples with features: {features}")
-    
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
+    train_df, val_df, test_df = time_split(df)
+    X_train, X_val, X_test = train_df[features], val_df[features], test_df[features]
+    y_train, y_val, y_test = train_df['main_aqi'], val_df['main_aqi'], test_df['main_aqi']
     if is_categorical:
-        print("Training Classifier...")
-        y_train = y_train.astype(int)
-        y_test = y_test.astype(int)
-        model = RandomForestClassifier(n_estimators=50, random_state=42, n_jobs=-1)
-        model.fit(X_train, y_train)
-        
-        y_pred = model.predict(X_test)
-        print("Accuracy:", accuracy_score(y_test, y_pred))
-        print(classification_report(y_test, y_pred))
-    else:
-        print("Training Regressor...")
-        model = RandomForestRegressor(n_estimators=50, random_state=42, n_jobs=-1)
-        model.fit(X_train, y_train)
-        print("Score:", model.score(X_test, y_test))
-        
+        y_train, y_val, y_test = y_train.astype(int), y_val.astype(int), y_test.astype(int)
+
+    print(f"Training on {X_train.shape[0]} samples (val {X_val.shape[0]}, test {X_test.shape[0]}) "
+          f"with features: {features}")
+
+    backends = BACKENDS if compare else [backend]
+    results, models = [], {}
+    for name in backends:
+        print(f"Training {name} {'Classifier' if is_categorical else 'Regressor'}...")
+        start = time.perf_counter()
+        model = BACKEND_FITTERS[name](X_train, y_train, X_val, y_val, is_categorical)
+        fit_seconds = time.perf_counter() - start
+        score = evaluate(model, X_test, y_test, is_categorical)
+        models[name] = model
+        results.append({
+            "backend": name,
+            "fit_seconds": round(fit_seconds, 2),
+            "model_mb": round(model_size_mb(model), 2),
+            "accuracy" if is_categorical else "r2": round(score, 4),
+        })
+
+    if compare:
+        report = pd.DataFrame(results)
+        report.to_csv(REPORT_FILE, index=False)
+        print(f"Backend comparison saved to {REPORT_FILE}")
+        print(report.to_string(index=False))
+
     # Save
-    print("Saving model and artifacts...")
-    joblib.dump(model, os.path.join(OUTPUT_PATH, "aqi_model.pkl"))
+    print(f"Saving {backend} model and artifacts...")
+    joblib.dump(models[backend], os.path.join(OUTPUT_PATH, "aqi_model.pkl"))
     joblib.dump(features, os.path.join(OUTPUT_PATH, "model_features.pkl"))
     
     # Save city list for app
@@ -172,4 +278,9 @@ def train():
     print("Training Complete!")
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the AQI model")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--compare", action="store_true",
+                        help="fit every backend and write a time/size/accuracy report")
+    args = parser.parse_args()
+    train(backend=args.backend, compare=args.compare)